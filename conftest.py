@@ -0,0 +1,2 @@
+# Root conftest: pytest puts this directory on sys.path, so the tests can import
+# the app modules (model, services, views) directly without sys.path hacks.
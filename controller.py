@@ -0,0 +1,51 @@
+import streamlit as st
+from datetime import date
+from model import FinancialModel, BusinessEvent, ProjectionResult, EVENT_KEY_FIELDS
+import views.sidebar as sidebar
+
+PROJECTION_MONTHS = 120
+# Bounds on the cross-session projection cache, so a long-running server
+# doesn't keep every scenario anyone has tried
+PROJECTION_CACHE_ENTRIES = 32
+PROJECTION_CACHE_TTL = 3600 # seconds
+
+# --- Cached Projection ---
+@st.cache_data(show_spinner=False, max_entries=PROJECTION_CACHE_ENTRIES, ttl=PROJECTION_CACHE_TTL)
+def _compute_projection(config_tuple: tuple, events_tuple: tuple, start_date, months: int) -> ProjectionResult:
+    """Runs the model for a hashable snapshot of the config; reruns with unchanged inputs hit the cache."""
+    config = dict(config_tuple) # seasonality tuple is converted by FinancialModel
+    events = [BusinessEvent(**dict(zip(EVENT_KEY_FIELDS, fields))) for fields in events_tuple]
+    model = FinancialModel(**config, events=events)
+    return model.project(start_date=start_date, months=months)
+
+def _inputs_summary(config: dict) -> dict:
+    """Headline assumptions passed to the AI CFO and the dashboard."""
+    return {
+        "rev_growth": config['revenue_growth_rate'],
+        "operating_hours": config['operating_hours'],
+        "loan_amount": config['loan_amount'],
+        "interest_rate": config['interest_rate'],
+        "avg_staff": config['avg_staff'],
+        "hourly_wage": config['hourly_wage'],
+        "revenue_growth_rate": config['revenue_growth_rate'],
+        "commercial_rent_income": config['commercial_rent_income'],
+        "residential_rent_income": config['residential_rent_income']
+    }
+
+def run() -> tuple[ProjectionResult, FinancialModel, dict, date]:
+    """
+    Shared pipeline for every page: session state -> config -> (cached) projection.
+    Expects the sidebar to have been rendered so the session state is initialized.
+    """
+    # 1. Get Configuration (State -> Dict)
+    config = sidebar.get_model_config()
+
+    # 2. Run Model (Logic)
+    start_date = config.pop('start_date', None)
+    model = FinancialModel(**config)
+    config_tuple = tuple(sorted(
+        (k, tuple(v) if k == "seasonality" else v) for k, v in config.items() if k != "events"
+    ))
+    projection = _compute_projection(config_tuple, model.events_key(), start_date, PROJECTION_MONTHS)
+
+    return projection, model, _inputs_summary(config), start_date
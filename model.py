@@ -1,15 +1,68 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from collections import OrderedDict
+import threading
 from typing import List, Dict
 import pandas as pd
 import numpy as np
 from datetime import date
-from dateutil.relativedelta import relativedelta
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # --- Constants ---
 # Updated Base Revenue to align with $425k/yr legacy pro forma
 DAYS_IN_MONTH = 30.5
 
-@dataclass
+# --- Event Codes ---
+# Events are lowered to these integer codes before projecting, so they can be
+# evaluated as arrays instead of by string comparisons.
+FREQ_ONE_TIME, FREQ_MONTHLY, FREQ_QUARTERLY, FREQ_ANNUALLY, FREQ_UNKNOWN = range(5)
+FREQUENCY_CODES = {
+    "One-time": FREQ_ONE_TIME,
+    "Monthly": FREQ_MONTHLY,
+    "Quarterly": FREQ_QUARTERLY,
+    "Annually": FREQ_ANNUALLY,
+}
+
+TARGET_REVENUE, TARGET_COGS, TARGET_LABOR, TARGET_OPS, TARGET_RENT, TARGET_CAPEX, TARGET_UNKNOWN = range(7)
+TARGET_CODES = {
+    "Revenue": TARGET_REVENUE,
+    "COGS": TARGET_COGS,
+    "Labor": TARGET_LABOR,
+    "Ops (Fixed)": TARGET_OPS,
+    "Rent": TARGET_RENT,
+    "Capex": TARGET_CAPEX,
+}
+
+BASIS_CODES = {"Revenue": 0, "COGS": 1, "Labor": 2, "Ops (Fixed)": 3, "Rent": 4, "Capex": 5, "NOI": 6}
+BASIS_NOI = BASIS_CODES["NOI"]
+BASIS_UNKNOWN = len(BASIS_CODES)
+
+VALUE_FIXED, VALUE_PERCENT, VALUE_NONE = range(3)
+
+# Impact slots: (impact_target, affected_entity) collapsed into one accumulator
+# row, so applying an event is a single indexed add instead of a branch per target.
+(SLOT_REVENUE, SLOT_COGS, SLOT_LABOR, SLOT_OPS_STORE, SLOT_OPS_PROP,
+ SLOT_RENT, SLOT_CAPEX_STORE, SLOT_CAPEX_PROP, SLOT_NONE) = range(9)
+IMPACT_SLOTS = SLOT_NONE + 1
+# Indexed by [target code, is_property]; Ops and Capex split by entity
+TARGET_SLOTS = np.array([
+    (SLOT_REVENUE, SLOT_REVENUE),         # Revenue
+    (SLOT_COGS, SLOT_COGS),               # COGS
+    (SLOT_LABOR, SLOT_LABOR),             # Labor
+    (SLOT_OPS_STORE, SLOT_OPS_PROP),      # Ops (Fixed)
+    (SLOT_RENT, SLOT_RENT),               # Rent
+    (SLOT_CAPEX_STORE, SLOT_CAPEX_PROP),  # Capex
+    (SLOT_NONE, SLOT_NONE),               # unknown target: recorded, no impact
+])
+
+@dataclass(slots=True)
 class BusinessEvent:
     name: str
     start_month: int
@@ -23,18 +76,266 @@ class BusinessEvent:
     description: str = ""
     is_active: bool = True
 
-def calculate_monthly_payment(principal, annual_rate, years):
+# Event fields that affect the projection (description is display-only)
+EVENT_KEY_FIELDS = (
+    "name", "start_month", "end_month", "frequency", "impact_target", "pct_basis",
+    "value_type", "value", "affected_entity", "is_active",
+)
+
+def _event_value_kind(e: BusinessEvent) -> int:
+    if e.value_type == "Fixed Amount ($)":
+        return VALUE_FIXED
+    if "Percent" in e.value_type or "%" in e.value_type: # Handle "Percentage (%)" or legacy strings
+        return VALUE_PERCENT
+    return VALUE_NONE
+
+def _event_basis(e: BusinessEvent) -> int:
+    # Check explicit basis first
+    basis_to_use = e.pct_basis
+
+    # Fallback for legacy "Value Type" strings that were like "% of Revenue"
+    if "Revenue" in e.value_type: basis_to_use = "Revenue"
+    elif "COGS" in e.value_type: basis_to_use = "COGS"
+    elif "Ops" in e.value_type: basis_to_use = "Ops (Fixed)"
+    elif "NOI" in e.value_type: basis_to_use = "NOI"
+    elif "Previous Quarter" in e.value_type: basis_to_use = "NOI"
+
+    return BASIS_CODES.get(basis_to_use, BASIS_UNKNOWN)
+
+@dataclass
+class EventArrays:
+    """Struct-of-arrays view of a list of BusinessEvents (one entry per event)."""
+    is_active: np.ndarray
+    start_month: np.ndarray
+    end_month: np.ndarray
+    freq_code: np.ndarray
+    value_kind: np.ndarray
+    basis_code: np.ndarray
+    impact_slot: np.ndarray
+    value: np.ndarray
+
+    @classmethod
+    def from_events(cls, events: List[BusinessEvent]) -> "EventArrays":
+        n = len(events)
+        target_code = np.fromiter((TARGET_CODES.get(e.impact_target, TARGET_UNKNOWN) for e in events), dtype=np.int64, count=n)
+        is_property = np.fromiter((e.affected_entity == "Property" for e in events), dtype=np.int64, count=n)
+        return cls(
+            is_active=np.fromiter((e.is_active for e in events), dtype=bool, count=n),
+            start_month=np.fromiter((e.start_month for e in events), dtype=np.int64, count=n),
+            end_month=np.fromiter((e.end_month for e in events), dtype=np.int64, count=n),
+            freq_code=np.fromiter((FREQUENCY_CODES.get(e.frequency, FREQ_UNKNOWN) for e in events), dtype=np.int64, count=n),
+            value_kind=np.fromiter((_event_value_kind(e) for e in events), dtype=np.int64, count=n),
+            basis_code=np.fromiter((_event_basis(e) for e in events), dtype=np.int64, count=n),
+            impact_slot=TARGET_SLOTS[target_code, is_property],
+            value=np.fromiter((e.value for e in events), dtype=np.float64, count=n),
+        )
+
+@lru_cache(maxsize=256)
+def calculate_monthly_payment(principal: float, annual_rate: float, years: int) -> float:
     if principal <= 0: return 0.0
     if annual_rate <= 0: return principal / (years * 12)
     r = (annual_rate / 100) / 12
+    x = (1 + r) ** (years * 12)
+    return principal * r * x / (x - 1)
+
+def calculate_monthly_payments(principal, annual_rate, years) -> np.ndarray:
+    """
+    Array version of calculate_monthly_payment: inputs broadcast against each
+    other, so a whole rate x term grid is priced in one call.
+    """
+    principal, annual_rate, years = np.broadcast_arrays(
+        np.asarray(principal, dtype=np.float64),
+        np.asarray(annual_rate, dtype=np.float64),
+        np.asarray(years, dtype=np.float64),
+    )
     n = years * 12
-    return principal * (r * (1 + r)**n) / ((1 + r)**n - 1)
+    r = np.maximum(annual_rate, 0.0) / 100 / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (1 + r) ** n
+        payment = np.where(annual_rate > 0, principal * r * x / (x - 1), principal / n)
+    return np.where(principal > 0, payment, 0.0)
+
+@njit(cache=True)
+def _noi_lookback_window(freq_code):
+    """NOI lookback (months) for a "% of NOI" event; anything but Quarterly/Annually looks back one month."""
+    if freq_code == FREQ_QUARTERLY:
+        return 3
+    if freq_code == FREQ_ANNUALLY:
+        return 12
+    return 1
+
+@njit(cache=True)
+def _apply_noi_events(applies, noi_event_idx, ev_freq, ev_slot, ev_value,
+                      base_rev, base_cogs, base_labor, base_ops, base_rent,
+                      event_values, impacts):
+    """Resolve "% of NOI" events month by month, adding into `impacts` (months x slots) in place.
+
+    Each month looks back at the pre-bonus NOI of prior months, which already
+    includes earlier event impacts, so this is a true recurrence.
+    """
+    months = applies.shape[0]
+    # Running total of pre-bonus NOI: noi_cum[i] = NOI of months 1..i, so any
+    # lookback window sum is one subtraction
+    noi_cum = np.zeros(months + 1)
+    for i in range(months):
+        m_i = i + 1
+        for j in noi_event_idx:
+            if not applies[i, j]:
+                continue
+
+            # Determine lookback window based on frequency
+            window = _noi_lookback_window(ev_freq[j])
+            model_base_val = 0.0
+            if m_i > window:
+                noi_sum = noi_cum[i] - noi_cum[i - window]
+                model_base_val = noi_sum if noi_sum > 0 else 0.0
+            val = model_base_val * (ev_value[j] / 100.0)
+            event_values[i, j] = val
+            impacts[i, ev_slot[j]] += val
+
+        # Record this month's pre-bonus NOI for later lookbacks
+        store_noi_pre = (base_rev[i] + impacts[i, SLOT_REVENUE]) - (
+            (base_cogs[i] + impacts[i, SLOT_COGS])
+            + (base_labor[i] + impacts[i, SLOT_LABOR])
+            + (base_ops[i] + impacts[i, SLOT_OPS_STORE])
+            + (base_rent[i] + impacts[i, SLOT_RENT])
+        )
+        noi_cum[i + 1] = noi_cum[i] + store_noi_pre
+
+def _noi_window_values(store_noi_pre, applies, freq_code, value):
+    """
+    Values of "% of NOI" events whose impacts do not feed back into store NOI.
+    Month m sees the sum of NOI over months m-window..m-1 (floored at 0),
+    computed for every month at once as a shifted rolling sum.
+    """
+    months = store_noi_pre.shape[0]
+    m = np.arange(1, months + 1)
+    windows = np.array([_noi_lookback_window(f) for f in freq_code])
+    values = np.zeros(applies.shape)
+    for window in np.unique(windows):
+        cols = np.flatnonzero(windows == window)
+        rolling = np.convolve(store_noi_pre, np.ones(window))[:months]
+        prior = np.concatenate(([0.0], rolling[:-1])) # months m-window..m-1
+        base = np.where((m > window) & (prior > 0), prior, 0.0)
+        values[:, cols] = np.where(applies[:, cols], base[:, None] * (value[cols] / 100.0), 0.0)
+    return values
+
+@lru_cache(maxsize=8)
+def _time_indices(months):
+    """
+    Project month numbers 1..months and their 0-based project-year index.
+    Shared between projections of the same length, so returned read-only.
+    """
+    m = np.arange(1, months + 1)
+    project_year_idx = (m - 1) // 12
+    m.setflags(write=False)
+    project_year_idx.setflags(write=False)
+    return m, project_year_idx
+
+@lru_cache(maxsize=64)
+def _growth_table(rate_pct, n_years):
+    """
+    Annually compounded growth factors for project years 0..n_years-1.
+    Memoized on (rate, years): reruns mostly keep the growth rates, so the
+    tables are shared (read-only) instead of recomputed per projection.
+    """
+    table = (1 + rate_pct / 100.0) ** np.arange(n_years)
+    table.setflags(write=False)
+    return table
+
+# Projection columns that are point-in-time balances; when rolled up to a
+# period they report the period-end value, every other money column is summed.
+CALENDAR_COLUMNS = ("Year", "Month", "Quarter", "Project_Month", "Project_Year")
+BALANCE_COLUMNS = frozenset({
+    "Store_Cum", "Prop_Cum", "Owner_Cum", "Cash_Balance", "Cum_Capex",
+    "Property_Value", "Loan_Balance", "Property_Equity", "Intangible_Assets",
+})
+
+@dataclass
+class ProjectionResult:
+    """Projection columns as month-indexed NumPy vectors; frames are only built on request."""
+    arrays: Dict[str, np.ndarray]
+    # (inputs_key, start_date, months) the result was projected from; set by
+    # FinancialModel.project, so downstream caches can key on it cheaply
+    key: tuple = field(default=None, compare=False, repr=False)
+
+    def __repr__(self) -> str:
+        return f"ProjectionResult({len(self)} months, {len(self.arrays)} columns)"
+
+    def __len__(self) -> int:
+        return len(self.arrays["Project_Month"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Column access without building a frame, e.g. result['Store_Revenue'][0]."""
+        return self.arrays[column]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.arrays)
+
+    def to_frame(self, months=None) -> pd.DataFrame:
+        """Monthly DataFrame of the first `months` months (default: all)."""
+        if months is None:
+            return pd.DataFrame(self.arrays)
+        return pd.DataFrame({name: values[:months] for name, values in self.arrays.items()})
+
+    def as_float32(self) -> "ProjectionResult":
+        """
+        Copy with the monthly money flows stored as float32 (half the memory, ~7
+        significant digits); balances accumulate over the horizon, so stay float64.
+        """
+        return ProjectionResult({
+            name: values.astype(np.float32) if values.dtype == np.float64 and name not in BALANCE_COLUMNS else values
+            for name, values in self.arrays.items()
+        })
+
+    def rollup(self, by=("Year",), months=None) -> pd.DataFrame:
+        """
+        One row per period over the first `months` months (default: all), where a
+        period is a run of months sharing the `by` calendar columns: flows are
+        summed, balances are taken at the last month of the period.
+        """
+        n = len(self) if months is None else min(months, len(self))
+        if n == 0:
+            # No periods (reduceat can't take empty offsets): same columns, no rows
+            names = [*by, *(name for name in self.arrays if name not in CALENDAR_COLUMNS)]
+            return pd.DataFrame({name: self.arrays[name][:0] for name in names})
+        new_period = np.zeros(n, dtype=bool)
+        new_period[:1] = True
+        for col in by:
+            values = self.arrays[col][:n]
+            new_period[1:] |= values[1:] != values[:-1]
+        starts = np.flatnonzero(new_period)
+        ends = np.r_[starts[1:], n] - 1
+
+        rows = {col: self.arrays[col][starts] for col in by}
+        for name, values in self.arrays.items():
+            if name in CALENDAR_COLUMNS:
+                continue
+            values = values[:n]
+            rows[name] = values[ends] if name in BALANCE_COLUMNS else np.add.reduceat(values, starts)
+        return pd.DataFrame(rows)
+
+    def annual(self, months=None) -> pd.DataFrame:
+        """Calendar-year rollup (see rollup)."""
+        return self.rollup(("Year",), months)
+
+    def quarterly(self, months=None) -> pd.DataFrame:
+        """Calendar-quarter rollup (see rollup)."""
+        return self.rollup(("Year", "Quarter"), months)
+
+# --- Projection Cache ---
+# Most recent projections keyed on (inputs_key, start_date, months). Results are
+# shared between callers, so their arrays are made read-only; to_frame() copies.
+PROJECTION_CACHE_SIZE = 32
+_projection_cache: "OrderedDict[tuple, ProjectionResult]" = OrderedDict()
+_projection_cache_lock = threading.Lock()
 
 @dataclass
 class FinancialModel:
     # --- Inputs ---
     # Global Assumptions
-    seasonality: List[float]  
+    seasonality: tuple # Q1-Q4 multipliers (lists/arrays become a float tuple in __post_init__, keeping __eq__ usable)
     revenue_growth_rate: float 
     expense_growth_rate: float
     wage_growth_rate: float # New: Specific for Labor
@@ -81,327 +382,359 @@ class FinancialModel:
     # Dynamic Events
     events: List[BusinessEvent] = field(default_factory=list)
 
+    # (events key, EventArrays) from the last projection, reused while events are unchanged
+    _events_cache: tuple = field(default=None, init=False, repr=False, compare=False)
+    # (seasonality tuple, read-only float64 array) for indexing by quarter in the projection
+    _seasonality_cache: tuple = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.seasonality = tuple(float(f) for f in self.seasonality)
+        self._seasonality_array()
+
+    def _seasonality_array(self) -> np.ndarray:
+        """Seasonality as a read-only float64 array, rebuilt only if `seasonality` was reassigned."""
+        if self._seasonality_cache is None or self._seasonality_cache[0] is not self.seasonality:
+            factors = np.array(self.seasonality, dtype=np.float64)
+            factors.flags.writeable = False
+            self._seasonality_cache = (self.seasonality, factors)
+        return self._seasonality_cache[1]
+
+    def events_key(self) -> tuple:
+        """Hashable snapshot of the events (one tuple of EVENT_KEY_FIELDS per event), e.g. for cache keys."""
+        return tuple(tuple(getattr(e, f) for f in EVENT_KEY_FIELDS) for e in self.events)
+
+    def _events_soa(self) -> EventArrays:
+        """Returns the events as parallel NumPy arrays, rebuilt only when they change."""
+        key = self.events_key()
+        if self._events_cache is None or self._events_cache[0] != key:
+            self._events_cache = (key, EventArrays.from_events(self.events))
+        return self._events_cache[1]
+
     def calculate_projection(self, start_date: date, months=120) -> pd.DataFrame:
         """
         Generates a 120-month (10-year) projection dataframe.
         """
-        projection = []
-        
-        # Initial Calculations
-        monthly_debt_service = calculate_monthly_payment(
-            self.loan_amount, self.interest_rate, self.amortization_years
+        return self.project(start_date, months).to_frame()
+
+    def inputs_key(self) -> tuple:
+        """Hashable snapshot of every model input; equal keys give identical projections."""
+        return tuple(
+            self.events_key() if f.name == "events"
+            else getattr(self, f.name)
+            for f in fields(self) if f.init
+        )
+
+    def project(self, start_date: date, months=120) -> "ProjectionResult":
+        """
+        Runs the projection and returns its columns as NumPy vectors.
+        Results are memoized on the model inputs, so repeated runs with unchanged
+        inputs return the same (read-only) result.
+        """
+        key = (self.inputs_key(), start_date, months)
+        with _projection_cache_lock:
+            result = _projection_cache.get(key)
+            if result is not None:
+                _projection_cache.move_to_end(key)
+                return result
+
+        result = self._project(start_date, months)
+        result.key = key
+        for values in result.arrays.values():
+            values.setflags(write=False)
+
+        with _projection_cache_lock:
+            _projection_cache[key] = result
+            while len(_projection_cache) > PROJECTION_CACHE_SIZE:
+                _projection_cache.popitem(last=False)
+        return result
+
+    def _project(self, start_date: date, months: int) -> "ProjectionResult":
+        """
+        Every month-indexed quantity is computed over the whole horizon at once;
+        only "% of NOI" events that feed back into NOI are resolved month by month.
+        """
+        # --- Time Axis ---
+        m, project_year_idx = _time_indices(months)
+
+        # Calendar Calculations (absolute month count -> year / month)
+        abs_month = start_date.year * 12 + (start_date.month - 1) + (m - 1)
+        cal_year = abs_month // 12
+        cal_month = abs_month % 12 + 1
+        cal_quarter_idx = (cal_month - 1) // 3 # 0-3 index
+
+        # Growth Factors (Compounded Annually based on PROJECT year index)
+        # We keep growth tied to project longevity (Year 1 vs Year 2 of ownership), not calendar year.
+
+        # --- Growth Factors ---
+        # Only one factor per project year is needed, so build small per-year
+        # tables and gather them onto the month axis.
+        n_years = (months + 11) // 12
+        rev_growth_factor = _growth_table(self.revenue_growth_rate, n_years)[project_year_idx]
+        exp_growth_factor = _growth_table(self.expense_growth_rate, n_years)[project_year_idx]
+        wage_growth_factor = _growth_table(self.wage_growth_rate, n_years)[project_year_idx]
+        rent_growth_factor = _growth_table(self.rent_escalation_rate, n_years)[project_year_idx]
+
+        # Property Value Growth (Annual step is cleaner for pro formas)
+        prop_value_growth_factor = _growth_table(self.property_appreciation_rate, n_years)[project_year_idx]
+        current_property_value_period = self.initial_property_value * prop_value_growth_factor
+
+        # Use Calendar Seasonality
+        seasonality_factor = self._seasonality_array()[cal_quarter_idx]
+
+        # --- STORE OPERATION ---
+        # Revenue and COGS share the same growth x seasonality profile
+        rev_profile = rev_growth_factor * seasonality_factor
+
+        # 1. Revenue
+        monthly_base_rev = self.base_revenue * rev_profile
+
+        # 2. COGS (Base)
+        # COGS % = 100% - Gross Margin %
+        cogs_pct = 1.0 - (self.gross_margin_pct / 100.0)
+        cogs_base_amt = (self.base_revenue * cogs_pct) * rev_profile
+
+        # 3. Labor (Base)
+        # Every labor input is constant over the horizon, so the month-0 cost is
+        # worked out once as a scalar and only scaled by wage growth.
+        # Manager Cost
+        manager_hours_mo = self.manager_weekly_hours * 52.0 / 12.0
+        manager_mo_cost = self.manager_wage_hourly * manager_hours_mo
+
+        # Total Man-Hours Required
+        total_required_hours = self.avg_staff * self.operating_hours * DAYS_IN_MONTH
+
+        # Offset Logic: Subtract Manager Hours from Required Hours
+        # Assuming Manager counts as 1.0 staff when on floor
+        required_hourly_staff_hours = max(0.0, total_required_hours - manager_hours_mo)
+
+        # Hourly Staff Cost (With Offset)
+        staff_cost_mo = self.hourly_wage * required_hourly_staff_hours
+
+        # REF: Removed seasonality from labor as per user request
+        store_labor = (manager_mo_cost + staff_cost_mo) * wage_growth_factor
+
+        # 4. Store Ops Expenses (Detailed)
+        ex_util = self.utilities * exp_growth_factor
+        ex_ins = self.insurance * exp_growth_factor
+        ex_maint = self.maintenance * exp_growth_factor
+        ex_mktg = self.marketing * exp_growth_factor
+        ex_prof = self.professional_fees * exp_growth_factor
+
+        store_ops_expenses = ex_util + ex_ins + ex_maint + ex_mktg + ex_prof
+
+        # 5. Rent (Base)
+        store_rent_expense = self.commercial_rent_income * rent_growth_factor
+
+        # --- DYNAMIC EVENTS APPLICATION ---
+        # Events as parallel code arrays (cached until the events change)
+        events = self.events
+        soa = self._events_soa()
+
+        # 0-1. Only active events whose window overlaps the horizon can apply;
+        # every other event just keeps an all-zero breakdown column.
+        live_idx = np.flatnonzero(
+            soa.is_active & (np.maximum(soa.start_month, 1) <= np.minimum(soa.end_month, months))
+        )
+        ev_start, ev_end = soa.start_month[live_idx], soa.end_month[live_idx]
+        ev_freq, ev_kind, ev_basis = soa.freq_code[live_idx], soa.value_kind[live_idx], soa.basis_code[live_idx]
+        ev_slot, ev_value = soa.impact_slot[live_idx], soa.value[live_idx]
+
+        # 2. Applicability Matrix (months x live events): Time Window, Frequency
+        m_col = m[:, None]
+        month_delta = m_col - ev_start
+        applies = (ev_start <= m_col) & (m_col <= ev_end) & (
+            ((ev_freq == FREQ_ONE_TIME) & (month_delta == 0))
+            | (ev_freq == FREQ_MONTHLY)
+            | ((ev_freq == FREQ_QUARTERLY) & (month_delta % 3 == 0))
+            | ((ev_freq == FREQ_ANNUALLY) & (month_delta % 12 == 0))
         )
-        
+
+        # 3. Calculate Value
+        # Percentage events read their basis column; NOI-based ones are resolved below
+        is_noi_event = (ev_kind == VALUE_PERCENT) & (ev_basis == BASIS_NOI)
+        basis_values = np.zeros((months, BASIS_UNKNOWN + 1))
+        basis_values[:, BASIS_CODES["Revenue"]] = monthly_base_rev
+        basis_values[:, BASIS_CODES["COGS"]] = cogs_base_amt
+        basis_values[:, BASIS_CODES["Labor"]] = store_labor
+        basis_values[:, BASIS_CODES["Ops (Fixed)"]] = store_ops_expenses
+        basis_values[:, BASIS_CODES["Rent"]] = store_rent_expense
+
+        pct_values = basis_values[:, ev_basis] * (ev_value / 100.0)
+        event_values = np.where(ev_kind == VALUE_FIXED, ev_value, np.where(ev_kind == VALUE_PERCENT, pct_values, 0.0))
+        event_values = np.where(applies & ~is_noi_event, event_values, 0.0)
+
+        # 4. Apply to Target (accumulate each event into its impact slot)
+        impacts = np.zeros((months, IMPACT_SLOTS))
+        np.add.at(impacts, (slice(None), ev_slot), event_values)
+
+        # "% of NOI" events look back at the pre-bonus NOI of prior months, which
+        # already includes earlier event impacts.
+        noi_event_idx = np.flatnonzero(is_noi_event)
+        if noi_event_idx.size:
+            noi_slot = ev_slot[noi_event_idx]
+            # Capex, property-side ops and unknown targets sit below store NOI, so
+            # such events never change the NOI they look back at.
+            open_loop = np.isin(noi_slot, (SLOT_OPS_PROP, SLOT_CAPEX_STORE, SLOT_CAPEX_PROP, SLOT_NONE))
+            if open_loop.all():
+                store_noi_pre = (monthly_base_rev + impacts[:, SLOT_REVENUE]) - (
+                    (cogs_base_amt + impacts[:, SLOT_COGS])
+                    + (store_labor + impacts[:, SLOT_LABOR])
+                    + (store_ops_expenses + impacts[:, SLOT_OPS_STORE])
+                    + (store_rent_expense + impacts[:, SLOT_RENT])
+                )
+                noi_values = _noi_window_values(
+                    store_noi_pre, applies[:, noi_event_idx], ev_freq[noi_event_idx], ev_value[noi_event_idx]
+                )
+                event_values[:, noi_event_idx] = noi_values
+                np.add.at(impacts, (slice(None), noi_slot), noi_values)
+            else:
+                # At least one event feeds back into NOI: resolve month by month
+                _apply_noi_events(
+                    applies, noi_event_idx, ev_freq, ev_slot, ev_value,
+                    monthly_base_rev, cogs_base_amt, store_labor, store_ops_expenses, store_rent_expense,
+                    event_values, impacts,
+                )
+
+        event_rev_impact = impacts[:, SLOT_REVENUE]
+        event_cogs_impact = impacts[:, SLOT_COGS]
+        event_labor_impact = impacts[:, SLOT_LABOR]
+        event_ops_impact = impacts[:, SLOT_OPS_STORE]
+        event_prop_ops_impact = impacts[:, SLOT_OPS_PROP]
+        event_rent_impact = impacts[:, SLOT_RENT]
+        event_capex_store = impacts[:, SLOT_CAPEX_STORE]
+        event_capex_prop = impacts[:, SLOT_CAPEX_PROP]
+
+        # Track individual event impacts for the dataframe
+        # (every event gets a column, even inactive ones, to ensure consistent schema;
+        # events sharing a name share a column)
+        col_of = {}
+        event_col = np.array([col_of.setdefault(f"Event: {e.name}", len(col_of)) for e in events], dtype=np.int64)
+        breakdown = np.zeros((months, len(col_of)), order="F")
+        np.add.at(breakdown, (slice(None), event_col[live_idx]), event_values)
+        event_breakdown = {name: breakdown[:, c] for name, c in col_of.items()}
+
+        # Apply Accumulated Impacts
+        # Revenue
+        store_total_revenue = monthly_base_rev + event_rev_impact
+
+        # Expenses
+        store_cogs = cogs_base_amt + event_cogs_impact
+        store_labor = store_labor + event_labor_impact
+        store_ops_expenses = store_ops_expenses + event_ops_impact
+        store_rent_expense = store_rent_expense + event_rent_impact
+
+        # Prop Ops
         monthly_prop_tax = self.property_tax_annual / 12.0
-        
-        cumulative_cash_owner = 0.0
-        cumulative_cash_store = 0.0
-        cumulative_cash_prop = 0.0
-        
-        # New: Tracking Bank and Total Spend
+        prop_ops_expenses = monthly_prop_tax + event_prop_ops_impact
+
+        # --- PRE-BONUS NOI ---
+        store_total_outflow_pre_bonus = store_cogs + store_labor + store_ops_expenses + store_rent_expense
+        store_noi_pre_bonus = store_total_revenue - store_total_outflow_pre_bonus
+
+        # Final Store Net
+        store_net_cash = store_noi_pre_bonus - event_capex_store
+
+        # --- PROPERTY OPERATION ---
+        # Income
+        prop_comm_rent = store_rent_expense # Linked
+        prop_res_rent = self.residential_rent_income * rent_growth_factor
+
+        prop_total_income = prop_comm_rent + prop_res_rent
+
+        # Expenses
+        # Debt Service (Split Principal/Interest)
+        prop_debt_total = calculate_monthly_payment(
+            self.loan_amount, self.interest_rate, self.amortization_years
+        )
+        monthly_loan_rate = (self.interest_rate / 100.0) / 12.0
+
+        # Loan balance after m payments (closed-form amortization):
+        # B_m = P(1+r)^m - PMT((1+r)^m - 1)/r, or P - PMT*m at 0% interest
+        if monthly_loan_rate != 0:
+            compound = (1 + monthly_loan_rate) ** m
+            loan_balance = self.loan_amount * compound - prop_debt_total * (compound - 1) / monthly_loan_rate
+        else:
+            loan_balance = self.loan_amount - prop_debt_total * m
+        # Once paid off (or never drawn) the balance stays at 0
+        loan_balance = np.where(np.logical_or.accumulate(loan_balance <= 0), 0.0, loan_balance)
+
+        prop_net_cash = prop_total_income - prop_debt_total - prop_ops_expenses - event_capex_prop
+
+        # --- CONSOLIDATED OWNER VIEW ---
+        consolidated_cash = store_net_cash + prop_net_cash
+
+        cumulative_cash_store = np.cumsum(store_net_cash)
+        cumulative_cash_prop = np.cumsum(prop_net_cash)
+        cumulative_cash_owner = np.cumsum(consolidated_cash)
+
+        # Net Event Impact (Cash basis)
+        # Revenue Impact - (Expense Impacts) - (Capex)
+        total_event_expense_impact = event_cogs_impact + event_labor_impact + event_ops_impact + event_rent_impact + event_prop_ops_impact
+        total_event_capex = event_capex_store + event_capex_prop
+        net_event_impact = event_rev_impact - total_event_expense_impact - total_event_capex
+
         # Startup Logic: Sources - Uses
         # Sources = Equity + Loan
         # Uses = Property + Intangibles + Inventory
-        
         sources = self.initial_equity + self.loan_amount
         uses = self.initial_property_value + self.intangible_assets + self.initial_inventory + self.initial_renovations + self.closing_costs
-        
-        cash_balance = sources - uses
-        
-        # Track Asset Values per category
-        cumulative_capex = self.initial_inventory + self.initial_renovations # Tracking Inventory as part of "Physical/Capex" stack for now
-        
-        # Asset Tracking
-        current_loan_balance = self.loan_amount
-        current_property_value = self.initial_property_value
-        
-        monthly_loan_rate = (self.interest_rate / 100.0) / 12.0
 
-        for m in range(1, months + 1):
-            # Calendar Calculations
-            current_date = start_date + relativedelta(months=m-1)
-            cal_year = current_date.year
-            cal_month = current_date.month
-            cal_quarter_idx = (cal_month - 1) // 3 # 0-3 index
-            
-            # Growth Factors (Compounded Annually based on PROJECT year index)
-            # We keep growth tied to project longevity (Year 1 vs Year 2 of ownership), not calendar year.
-            project_year_idx = (m - 1) // 12
-            
-            # --- Growth Factors ---
-            rev_growth_factor = (1 + self.revenue_growth_rate / 100.0) ** project_year_idx
-            exp_growth_factor = (1 + self.expense_growth_rate / 100.0) ** project_year_idx
-            wage_growth_factor = (1 + self.wage_growth_rate / 100.0) ** project_year_idx
-            rent_growth_factor = (1 + self.rent_escalation_rate / 100.0) ** project_year_idx
-            
-            # Property Value Growth (Monthly compounding approximation or Annual step?)
-            # Usually Annual step is cleaner for pro formas
-            prop_value_growth_factor = (1 + self.property_appreciation_rate / 100.0) ** project_year_idx
-            current_property_value_period = self.initial_property_value * prop_value_growth_factor
-            
-            # Use Calendar Seasonality
-            seasonality_factor = self.seasonality[cal_quarter_idx]
-
-            # --- STORE OPERATION ---
-            # 1. Revenue
-            monthly_base_rev = self.base_revenue * rev_growth_factor * seasonality_factor
-            
-            # 2. COGS (Base)
-            # COGS % = 100% - Gross Margin %
-            cogs_pct = 1.0 - (self.gross_margin_pct / 100.0)
-            cogs_base_amt = (self.base_revenue * cogs_pct) * rev_growth_factor * seasonality_factor
-            
-            # 3. Labor (Base)
-            # Manager Cost
-            current_manager_wage = self.manager_wage_hourly * wage_growth_factor
-            manager_hours_mo = self.manager_weekly_hours * 52.0 / 12.0
-            manager_mo_cost = current_manager_wage * manager_hours_mo
-            
-            # Hourly Staff Cost (With Offset)
-            current_hourly_wage = self.hourly_wage * wage_growth_factor
-            
-            # Total Man-Hours Required
-            total_required_hours = self.avg_staff * self.operating_hours * DAYS_IN_MONTH
-            
-            # Offset Logic: Subtract Manager Hours from Required Hours
-            # Assuming Manager counts as 1.0 staff when on floor
-            required_hourly_staff_hours = max(0.0, total_required_hours - manager_hours_mo)
-            
-            staff_cost_mo = current_hourly_wage * required_hourly_staff_hours
-            
-            # Apply Seasonality to Hourly Staff only (Managers are usually fixed/stable presence)
-            # REF: Removed seasonality from labor as per user request
-            store_labor = manager_mo_cost + staff_cost_mo
-
-            # 4. Store Ops Expenses (Detailed)
-            ex_util = self.utilities * exp_growth_factor
-            ex_ins = self.insurance * exp_growth_factor
-            ex_maint = self.maintenance * exp_growth_factor
-            ex_mktg = self.marketing * exp_growth_factor
-            ex_prof = self.professional_fees * exp_growth_factor
-            
-            store_ops_expenses = ex_util + ex_ins + ex_maint + ex_mktg + ex_prof
-            
-            # 5. Rent (Base)
-            store_rent_expense = self.commercial_rent_income * rent_growth_factor
-
-            # --- DYNAMIC EVENTS APPLICATION ---
-            event_rev_impact = 0.0
-            event_cogs_impact = 0.0
-            event_labor_impact = 0.0
-            event_ops_impact = 0.0
-            event_rent_impact = 0.0
-            event_capex_store = 0.0
-            event_capex_prop = 0.0
-            event_prop_ops_impact = 0.0
-            
-            # Track individual event impacts for the dataframe
-            monthly_event_breakdown = {}
-
-            for e in self.events:
-                # Initialize column with 0 for every event to ensure consistent schema
-                if f"Event: {e.name}" not in monthly_event_breakdown:
-                     monthly_event_breakdown[f"Event: {e.name}"] = 0.0
-
-                # 0. Active Check
-                if not e.is_active:
-                    continue
-
-                # 1. Time Window Check
-                if not (e.start_month <= m <= e.end_month):
-                    continue
-                
-                # 2. Frequency Check
-                applies = False
-                month_delta = m - e.start_month
-                if e.frequency == "One-time":
-                    if m == e.start_month: applies = True
-                elif e.frequency == "Monthly":
-                    applies = True
-                elif e.frequency == "Quarterly":
-                    if month_delta % 3 == 0: applies = True
-                elif e.frequency == "Annually":
-                    if month_delta % 12 == 0: applies = True
-                
-                if not applies: continue
-
-                # 3. Calculate Value
-                val = 0.0
-                model_base_val = 0.0
-                
-                if e.value_type == "Fixed Amount ($)":
-                    val = e.value
-                elif "Percent" in e.value_type or "%" in e.value_type: # Handle "Percentage (%)" or legacy strings
-                    # Detemine Basis
-                    # Check explicit basis first
-                    basis_to_use = e.pct_basis
-                    
-                    # Fallback for legacy "Value Type" strings that were like "% of Revenue"
-                    if "Revenue" in e.value_type: basis_to_use = "Revenue"
-                    elif "COGS" in e.value_type: basis_to_use = "COGS"
-                    elif "Ops" in e.value_type: basis_to_use = "Ops (Fixed)"
-                    elif "NOI" in e.value_type: basis_to_use = "NOI"
-                    elif "Previous Quarter" in e.value_type: basis_to_use = "NOI"
-
-                    if basis_to_use == "Revenue":
-                        model_base_val = monthly_base_rev
-                    elif basis_to_use == "COGS":
-                        model_base_val = cogs_base_amt
-                    elif basis_to_use == "Labor":
-                        model_base_val = store_labor
-                    elif basis_to_use == "Ops (Fixed)":
-                        model_base_val = store_ops_expenses
-                    elif basis_to_use == "Rent":
-                        model_base_val = store_rent_expense
-                    elif basis_to_use == "Capex":
-                        model_base_val = 0.0 
-                    elif basis_to_use == "NOI":
-                         # Determine lookback window based on frequency
-                         window = 1
-                         if e.frequency == "Quarterly": window = 3
-                         elif e.frequency == "Annually": window = 12
-                         
-                         if m > window:
-                            noi_sum = 0.0
-                            for i in range(1, window + 1):
-                                 if (m - i - 1) >= 0:
-                                     prev_data = projection[m - i - 1]
-                                     noi_sum += prev_data.get("Store_NOI_Pre", 0.0)
-                            model_base_val = noi_sum if noi_sum > 0 else 0.0
-
-                    val = model_base_val * (e.value / 100.0)
-                
-                # Store breakdown
-                monthly_event_breakdown[f"Event: {e.name}"] += val
-
-                # 4. Apply to Target
-                if e.impact_target == "Revenue":
-                    event_rev_impact += val
-                elif e.impact_target == "COGS":
-                    event_cogs_impact += val
-                elif e.impact_target == "Labor":
-                    event_labor_impact += val
-                elif e.impact_target == "Ops (Fixed)":
-                    if e.affected_entity == "Property": 
-                        event_prop_ops_impact += val
-                    else:
-                        event_ops_impact += val
-                elif e.impact_target == "Rent":
-                    event_rent_impact += val
-                elif e.impact_target == "Capex":
-                    if e.affected_entity == "Property": event_capex_prop += val
-                    else: event_capex_store += val
-
-            # Apply Accumulated Impacts
-            # Revenue
-            store_total_revenue = monthly_base_rev + event_rev_impact
-
-            # Expenses
-            store_cogs = cogs_base_amt + event_cogs_impact
-            store_labor += event_labor_impact
-            store_ops_expenses += event_ops_impact
-            store_rent_expense += event_rent_impact
-            
-            # Prop Ops
-            prop_ops_expenses = monthly_prop_tax + event_prop_ops_impact
-            
-            # --- PRE-BONUS NOI ---
-            store_total_outflow_pre_bonus = store_cogs + store_labor + store_ops_expenses + store_rent_expense
-            store_noi_pre_bonus = store_total_revenue - store_total_outflow_pre_bonus
-            
-            # Final Store Net
-            store_net_cash = store_noi_pre_bonus - event_capex_store
-
-            # --- PROPERTY OPERATION ---
-            # Income
-            prop_comm_rent = store_rent_expense # Linked
-            prop_res_rent = self.residential_rent_income * rent_growth_factor 
-            
-            prop_total_income = prop_comm_rent + prop_res_rent
-            
-            # Expenses
-            # Debt Service (Split Principal/Interest)
-            # Interest Payment
-            interest_payment = current_loan_balance * monthly_loan_rate
-            prop_debt_total = monthly_debt_service
-            principal_payment = prop_debt_total - interest_payment
-            
-            # Update Balance
-            current_loan_balance -= principal_payment
-            if current_loan_balance < 0: current_loan_balance = 0
-            
-            # Prop Ops (calculated above from taxes + events)
-            
-            prop_net_cash = prop_total_income - prop_debt_total - prop_ops_expenses - event_capex_prop
-
-            # --- CONSOLIDATED OWNER VIEW ---
-            consolidated_cash = store_net_cash + prop_net_cash 
-            
-            cumulative_cash_store += store_net_cash
-            cumulative_cash_prop += prop_net_cash
-            cumulative_cash_owner += consolidated_cash
-            
-            # Net Event Impact (Cash basis)
-            # Revenue Impact - (Expense Impacts) - (Capex)
-            total_event_expense_impact = event_cogs_impact + event_labor_impact + event_ops_impact + event_rent_impact + event_prop_ops_impact
-            total_event_capex = event_capex_store + event_capex_prop
-            net_event_impact = event_rev_impact - total_event_expense_impact - total_event_capex
-
-            # Update Running Totals
-            cumulative_capex += total_event_capex
-            cash_balance += consolidated_cash # Drawdown or addition
-            
-            # Equity Calc
-            current_equity = current_property_value_period - current_loan_balance
-
-            row_data = {
-                "Year": cal_year,
-                "Month": cal_month,
-                "Quarter": cal_quarter_idx + 1,
-                "Project_Month": m,
-                "Project_Year": project_year_idx + 1,
-                
-                "Store_Revenue": store_total_revenue,
-                "Store_COGS": -store_cogs,
-                "Store_Labor": -store_labor,
-
-                "Store_Ops_Ex": -store_ops_expenses,
-                "Ex_Util": -ex_util,
-                "Ex_Ins": -ex_ins,
-                "Ex_Maint": -ex_maint,
-                "Ex_Mktg": -ex_mktg,
-                "Ex_Prof": -ex_prof,
-                "Store_Rent_Ex": -store_rent_expense,
-                
-                "Prop_Debt": -prop_debt_total,
-                "Prop_Tax": -monthly_prop_tax,
-                "Prop_Revenue": prop_total_income,
-                
-                "Store_Net": store_net_cash,
-                "Prop_Net": prop_net_cash,
-                
-                "Store_Cum": cumulative_cash_store,
-                "Prop_Cum": cumulative_cash_prop,
-                "Owner_Cum": cumulative_cash_owner,
-                "Owner_Cash_Flow": consolidated_cash,
-                
-                "Cash_Balance": cash_balance,
-                "Cum_Capex": cumulative_capex,
-                
-                "Capex": -total_event_capex,
-                "Net_Event_Impact": net_event_impact,
-                "Store_NOI_Pre": store_noi_pre_bonus,
-                
-                # New Balance Sheet Items
-                "Property_Value": current_property_value_period,
-                "Loan_Balance": current_loan_balance,
-                "Property_Equity": current_equity,
-                "Intangible_Assets": self.intangible_assets
-            }
-            
-            # Merge event columns
-            row_data.update(monthly_event_breakdown)
-            
-            projection.append(row_data)
-            
-        return pd.DataFrame(projection)
+        # Running Totals
+        # Tracking Inventory as part of "Physical/Capex" stack for now
+        cumulative_capex = (self.initial_inventory + self.initial_renovations) + np.cumsum(total_event_capex)
+        cash_balance = (sources - uses) + cumulative_cash_owner # Drawdown or addition
+
+        # Equity Calc
+        current_equity = current_property_value_period - loan_balance
+
+        # Calendar columns are small ints; money columns stay float64 since
+        # float32 can't hold cents on the cumulative/balance figures (~7 digits).
+        columns = {
+            "Year": cal_year.astype(np.int16),
+            "Month": cal_month.astype(np.int8),
+            "Quarter": (cal_quarter_idx + 1).astype(np.int8),
+            "Project_Month": m.astype(np.int16),
+            "Project_Year": (project_year_idx + 1).astype(np.int16),
+
+            "Store_Revenue": store_total_revenue,
+            "Store_COGS": -store_cogs,
+            "Store_Labor": -store_labor,
+
+            "Store_Ops_Ex": -store_ops_expenses,
+            "Ex_Util": -ex_util,
+            "Ex_Ins": -ex_ins,
+            "Ex_Maint": -ex_maint,
+            "Ex_Mktg": -ex_mktg,
+            "Ex_Prof": -ex_prof,
+            "Store_Rent_Ex": -store_rent_expense,
+
+            "Prop_Debt": np.full(months, -prop_debt_total),
+            "Prop_Tax": np.full(months, -monthly_prop_tax),
+            "Prop_Revenue": prop_total_income,
+
+            "Store_Net": store_net_cash,
+            "Prop_Net": prop_net_cash,
+
+            "Store_Cum": cumulative_cash_store,
+            "Prop_Cum": cumulative_cash_prop,
+            "Owner_Cum": cumulative_cash_owner,
+            "Owner_Cash_Flow": consolidated_cash,
+
+            "Cash_Balance": cash_balance,
+            "Cum_Capex": cumulative_capex,
+
+            "Capex": -total_event_capex,
+            "Net_Event_Impact": net_event_impact,
+            "Store_NOI_Pre": store_noi_pre_bonus,
+
+            # New Balance Sheet Items
+            "Property_Value": current_property_value_period,
+            "Loan_Balance": loan_balance,
+            "Property_Equity": current_equity,
+            "Intangible_Assets": np.full(months, self.intangible_assets)
+        }
+
+        # Merge event columns
+        columns.update(event_breakdown)
+
+        return ProjectionResult(columns)
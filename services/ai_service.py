@@ -1,55 +1,129 @@
 import os
-import openai
-import anthropic
-from google import genai
+import hashlib
+import threading
 
-def ask_ai(prompt, context, provider="Google (Gemini)", api_key=None, model_id="gemini-2.0-flash-exp"):
+PROMPT_TEMPLATE = (
+    "Context: {context}\n\nUser Question: {prompt}\n\n"
+    "Please provide a concise, financial-expert response.\n"
+    "IMPORTANT: If the user asks for calculating metrics, LOOK at the 'Full_Data_CSV' key in the Context before saying you don't have data."
+)
+
+# SDK clients per (provider, sha256 of the key); the raw key is never a cache key
+_CLIENTS = {}
+_clients_lock = threading.Lock()
+
+def _build_client(provider, api_key):
+    # SDKs are imported here, so only the provider actually used is ever loaded
+    if provider == "Google (Gemini)":
+        from google import genai
+        return genai.Client(api_key=api_key)
+    if provider == "OpenAI":
+        import openai
+        return openai.OpenAI(api_key=api_key)
+    if provider == "Anthropic":
+        import anthropic
+        return anthropic.Anthropic(api_key=api_key)
+    raise ValueError(f"Unknown provider: {provider}")
+
+def _get_client(provider, api_key):
     """
-    Queries the selected AI Provider for financial advice.
+    Returns a shared SDK client per (provider, key), so repeated questions reuse
+    the client's open HTTP connections instead of a fresh TLS handshake each time.
     """
-    full_prompt = f"Context: {context}\n\nUser Question: {prompt}\n\nPlease provide a concise, financial-expert response.\nIMPORTANT: If the user asks for calculating metrics, LOOK at the 'Full_Data_CSV' key in the Context before saying you don't have data."
-    
+    key = (provider, hashlib.sha256(api_key.encode()).hexdigest())
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _CLIENTS.get(key)
+            if client is None:
+                client = _CLIENTS[key] = _build_client(provider, api_key)
+    return client
+
+def clear_cache():
+    """Drops every cached client (e.g. after a key is rotated, or between tests)."""
+    with _clients_lock:
+        _CLIENTS.clear()
+
+SYSTEM_PROMPT = "You are an expert CFO consultant."
+
+# Provider -> (environment variable holding its API key, name used in messages)
+_PROVIDER_KEYS = {
+    "Google (Gemini)": ("GOOGLE_API_KEY", "Google"),
+    "OpenAI": ("OPENAI_API_KEY", "OpenAI"),
+    "Anthropic": ("ANTHROPIC_API_KEY", "Anthropic"),
+}
+
+def _query(prompt, context, provider, api_key, model_id, stream):
+    """
+    Shared path for ask_ai and stream_ai: key lookup, client, error handling.
+    Yields the response text, in pieces when streaming and as exactly one piece
+    otherwise; only the final SDK call differs between the two modes.
+    """
+    if provider not in _PROVIDER_KEYS:
+        yield "⚠️ Unknown Provider selected."
+        return
+    env_var, name = _PROVIDER_KEYS[provider]
+    key_to_use = api_key if api_key else os.environ.get(env_var)
+    if not key_to_use:
+        yield f"⚠️ Missing {name} API Key."
+        return
+
+    full_prompt = PROMPT_TEMPLATE.format(context=context, prompt=prompt)
+
     try:
+        client = _get_client(provider, key_to_use)
+
         # --- Google Gemini ---
         if provider == "Google (Gemini)":
-            key_to_use = api_key if api_key else os.environ.get("GOOGLE_API_KEY")
-            if not key_to_use: return "⚠️ Missing Google API Key."
-            
-            client = genai.Client(api_key=key_to_use)
-            response = client.models.generate_content(model=model_id, contents=full_prompt)
-            return response.text
+            if stream:
+                for chunk in client.models.generate_content_stream(model=model_id, contents=full_prompt):
+                    yield chunk.text or ""
+            else:
+                yield client.models.generate_content(model=model_id, contents=full_prompt).text
 
         # --- OpenAI ---
         elif provider == "OpenAI":
-            key_to_use = api_key if api_key else os.environ.get("OPENAI_API_KEY")
-            if not key_to_use: return "⚠️ Missing OpenAI API Key."
-
-            client = openai.OpenAI(api_key=key_to_use)
             response = client.chat.completions.create(
                 model=model_id,
                 messages=[
-                    {"role": "system", "content": "You are an expert CFO consultant."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": full_prompt}
-                ]
+                ],
+                stream=stream
             )
-            return response.choices[0].message.content
+            if stream:
+                for chunk in response:
+                    if chunk.choices:
+                        yield chunk.choices[0].delta.content or ""
+            else:
+                yield response.choices[0].message.content
 
         # --- Anthropic ---
-        elif provider == "Anthropic":
-            key_to_use = api_key if api_key else os.environ.get("ANTHROPIC_API_KEY")
-            if not key_to_use: return "⚠️ Missing Anthropic API Key."
-            
-            client = anthropic.Anthropic(api_key=key_to_use)
-            response = client.messages.create(
+        else:
+            request = dict(
                 model=model_id,
                 max_tokens=1024,
-                system="You are an expert CFO consultant.",
+                system=SYSTEM_PROMPT,
                 messages=[{"role": "user", "content": full_prompt}]
             )
-            return response.content[0].text
-
-        else:
-            return "⚠️ Unknown Provider selected."
+            if stream:
+                with client.messages.stream(**request) as response:
+                    yield from response.text_stream
+            else:
+                yield client.messages.create(**request).content[0].text
 
     except Exception as e:
-        return f"⚠️ Error querying {provider}: {str(e)}"
+        yield f"⚠️ Error querying {provider}: {str(e)}"
+
+def ask_ai(prompt, context, provider="Google (Gemini)", api_key=None, model_id="gemini-2.0-flash-exp"):
+    """
+    Queries the selected AI Provider for financial advice.
+    """
+    return next(_query(prompt, context, provider, api_key, model_id, stream=False))
+
+def stream_ai(prompt, context, provider="Google (Gemini)", api_key=None, model_id="gemini-2.0-flash-exp"):
+    """
+    Streaming version of ask_ai: yields the response text as it arrives, so the
+    UI can show the first tokens instead of waiting for the full completion.
+    """
+    return _query(prompt, context, provider, api_key, model_id, stream=True)
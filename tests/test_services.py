@@ -1,16 +1,16 @@
 import unittest
 from unittest.mock import patch, MagicMock
-import sys
 import os
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from services.ai_service import ask_ai
+from services.ai_service import ask_ai, stream_ai, clear_cache
 
 class TestAIService(unittest.TestCase):
 
-    @patch('services.ai_service.genai.Client')
+    def setUp(self):
+        # Clients are cached per (provider, key); start each test with a fresh cache
+        clear_cache()
+
+    @patch('google.genai.Client')
     def test_ask_ai_google(self, mock_client_cls):
         # Setup mocking
         mock_client = MagicMock()
@@ -26,7 +26,7 @@ class TestAIService(unittest.TestCase):
         self.assertEqual(response, "Gemini Response")
         mock_client.models.generate_content.assert_called_once()
 
-    @patch('services.ai_service.openai.OpenAI')
+    @patch('openai.OpenAI')
     def test_ask_ai_openai(self, mock_openai):
         # Setup
         mock_client = MagicMock()
@@ -44,7 +44,7 @@ class TestAIService(unittest.TestCase):
         self.assertEqual(response, "GPT Response")
         mock_client.chat.completions.create.assert_called_once()
     
-    @patch('services.ai_service.anthropic.Anthropic')
+    @patch('anthropic.Anthropic')
     def test_ask_ai_anthropic(self, mock_anthropic):
         # Setup
         mock_client = MagicMock()
@@ -62,9 +62,60 @@ class TestAIService(unittest.TestCase):
         self.assertEqual(response, "Claude Response")
         mock_client.messages.create.assert_called_once()
 
+    @patch('openai.OpenAI')
+    def test_client_reused_across_calls(self, mock_openai):
+        ask_ai("Q1", "C", provider="OpenAI", api_key="fake-key")
+        ask_ai("Q2", "C", provider="OpenAI", api_key="fake-key")
+        mock_openai.assert_called_once_with(api_key="fake-key")
+
+        ask_ai("Q3", "C", provider="OpenAI", api_key="other-key")
+        self.assertEqual(mock_openai.call_count, 2)
+
+        # Clearing the cache builds a fresh client
+        clear_cache()
+        ask_ai("Q4", "C", provider="OpenAI", api_key="fake-key")
+        self.assertEqual(mock_openai.call_count, 3)
+
+    @patch('openai.OpenAI')
+    def test_stream_ai_openai(self, mock_openai):
+        # Setup: two content deltas and a final chunk without content
+        chunks = []
+        for text in ["Hello ", "CFO", None]:
+            chunk = MagicMock()
+            chunk.choices = [MagicMock(delta=MagicMock(content=text))]
+            chunks.append(chunk)
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = iter(chunks)
+        mock_openai.return_value = mock_client
+
+        parts = list(stream_ai("Question", "Context", provider="OpenAI", api_key="fake-key"))
+
+        self.assertEqual("".join(parts), "Hello CFO")
+        self.assertTrue(mock_client.chat.completions.create.call_args.kwargs["stream"])
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_stream_ai_missing_api_key(self):
+        parts = list(stream_ai("Q", "C", provider="Anthropic", api_key=""))
+        self.assertIn("Missing Anthropic API Key", "".join(parts))
+
     def test_missing_api_key(self):
         response = ask_ai("Q", "C", provider="OpenAI", api_key="")
         self.assertIn("Missing OpenAI API Key", response)
 
+    @patch('anthropic.Anthropic')
+    def test_stream_ai_anthropic(self, mock_anthropic):
+        mock_stream = MagicMock()
+        mock_stream.__enter__.return_value.text_stream = iter(["Claude ", "Response"])
+        mock_anthropic.return_value.messages.stream.return_value = mock_stream
+
+        parts = list(stream_ai("Question", "Context", provider="Anthropic", api_key="fake-key"))
+
+        self.assertEqual("".join(parts), "Claude Response")
+        mock_anthropic.return_value.messages.create.assert_not_called()
+
+    def test_unknown_provider(self):
+        self.assertEqual(ask_ai("Q", "C", provider="Other", api_key="k"), "⚠️ Unknown Provider selected.")
+        self.assertEqual(list(stream_ai("Q", "C", provider="Other", api_key="k")), ["⚠️ Unknown Provider selected."])
+
 if __name__ == '__main__':
     unittest.main()
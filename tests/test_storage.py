@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
+from datetime import date
+
+import numpy as np
+
+from utils import storage
+
+class TestScenarioStorage(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = os.path.join(tmp_dir.name, "scenarios.db")
+        self.legacy_path = os.path.join(tmp_dir.name, "scenarios.json")
+
+        for name, path in (("SCENARIO_DB", self.db_path), ("LEGACY_SCENARIO_FILE", self.legacy_path)):
+            file_patch = patch.object(storage, name, path)
+            file_patch.start()
+            self.addCleanup(file_patch.stop)
+
+    def test_empty_store(self):
+        self.assertEqual(storage.load_scenarios(), {})
+
+    def test_save_and_load(self):
+        storage.save_scenario("Base", {"loan_amount": 500000.0})
+        storage.save_scenario("Stretch", {"loan_amount": 650000.0})
+
+        self.assertEqual(storage.load_scenarios(), {
+            "Base": {"loan_amount": 500000.0},
+            "Stretch": {"loan_amount": 650000.0},
+        })
+
+    def test_overwrite_keeps_order(self):
+        storage.save_scenario("Base", {"loan_amount": 500000.0})
+        storage.save_scenario("Stretch", {"loan_amount": 650000.0})
+        storage.save_scenario("Base", {"loan_amount": 450000.0})
+
+        scenarios = storage.load_scenarios()
+        self.assertEqual(list(scenarios), ["Base", "Stretch"])
+        self.assertEqual(scenarios["Base"]["loan_amount"], 450000.0)
+
+    def test_wal_mode(self):
+        with storage._connect() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_save_from_another_thread(self):
+        # Streamlit runs each script on its own thread; no connection is tied to one
+        worker = threading.Thread(target=storage.save_scenario, args=("Base", {"loan_amount": 500000.0}))
+        worker.start()
+        worker.join()
+        self.assertEqual(storage.load_scenarios(), {"Base": {"loan_amount": 500000.0}})
+
+    def test_legacy_json_is_imported(self):
+        with open(self.legacy_path, "w") as f:
+            json.dump({"Old": {"loan_amount": 1.0}}, f)
+
+        self.assertEqual(storage.load_scenarios(), {"Old": {"loan_amount": 1.0}})
+
+    def test_legacy_import_is_not_repeated(self):
+        with open(self.legacy_path, "w") as f:
+            json.dump({"Old": {"loan_amount": 1.0}}, f)
+        storage.load_scenarios()
+
+        # A second process setting up the same database finds it populated
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            storage._import_legacy_file(conn)
+        self.assertEqual(storage.load_scenarios(), {"Old": {"loan_amount": 1.0}})
+
+    def test_setup_runs_once_per_database(self):
+        with patch.object(storage, "_setup", wraps=storage._setup) as setup:
+            storage.save_scenario("Base", {"loan_amount": 500000.0})
+            storage.load_scenarios()
+        setup.assert_called_once()
+
+    @patch.object(storage, "orjson", None)
+    def test_stdlib_json_fallback(self):
+        storage.save_scenario("Base", {"loan_amount": 500000.0, "seasonality": [0.9, 1.1]})
+        self.assertEqual(storage.load_scenarios()["Base"]["seasonality"], [0.9, 1.1])
+
+    def test_numpy_and_dates_with_and_without_orjson(self):
+        data = {
+            "loan_amount": np.float64(500000.0), "amortization_years": np.int64(25),
+            "seasonality": np.array([0.9, 1.1]), "start_date": date(2024, 1, 1),
+        }
+        expected = {"loan_amount": 500000.0, "amortization_years": 25, "seasonality": [0.9, 1.1], "start_date": "2024-01-01"}
+
+        storage.save_scenario("Base", data)
+        with patch.object(storage, "orjson", None):
+            storage.save_scenario("Fallback", data)
+            self.assertEqual(storage.load_scenarios()["Fallback"], expected)
+        self.assertEqual(storage.load_scenarios()["Base"], expected)
+
+if __name__ == '__main__':
+    unittest.main()
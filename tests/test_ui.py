@@ -1,42 +1,58 @@
 from streamlit.testing.v1 import AppTest
 import unittest
-import sys
 import os
 
-# Add parent directory
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+APP_FILE = os.path.join(os.path.dirname(__file__), "..", "app.py")
 
 class TestAppUI(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Boot the app once and share it; tests that change widgets restore them
+        cls.at = AppTest.from_file(APP_FILE, default_timeout=30)
+        cls.at.run()
+
+    def _select_section(self, section):
+        self.at.radio(key='active_tab').set_value(section).run()
+
     def test_app_load(self):
         """Smoke test: Verify the app runs without error"""
-        at = AppTest.from_file("app.py", default_timeout=30)
-        at.run()
-        
-        # Check title
-        self.assertFalse(at.exception, "App crashed with an exception")
-        
+        self.assertFalse(self.at.exception, "App crashed with an exception")
+
     def test_sidebar_defaults(self):
-        """Verify sidebar inputs exist"""
-        at = AppTest.from_file("app.py", default_timeout=30)
-        at.run()
-        
-        # Check for key inputs in sidebar
+        """Verify key model inputs exist"""
         # Note: Accessing by key is most reliable
-        self.assertIsNotNone(at.sidebar.number_input('loan_amount'))
-        self.assertIsNotNone(at.sidebar.slider('operating_hours'))
-        
+        # (the inputs live in the dashboard sections; only the selected one is rendered)
+        self._select_section("🤝 Acquisition")
+        self.assertIsNotNone(self.at.number_input(key='loan_amount'))
+
         # Verify default loan amount
-        self.assertEqual(at.sidebar.number_input('loan_amount').value, 320000.0)
+        self.assertEqual(self.at.number_input(key='loan_amount').value, 320000.0)
+
+        self._select_section("👥 Staffing")
+        self.assertIsNotNone(self.at.slider(key='operating_hours'))
+
+    def test_hidden_section_keeps_inputs(self):
+        """Inputs of sections that aren't rendered keep their values"""
+        self._select_section("👥 Staffing")
+        staff = self.at.slider(key='operating_hours').value
+
+        self._select_section("✨ Events")
+        self.assertFalse(self.at.exception)
+        self.assertEqual(self.at.session_state['operating_hours'], staff)
+        self.assertEqual(self.at.session_state['loan_amount'], 320000.0)
 
     def test_interaction(self):
         """Verify changing an input triggers rerun and no error"""
-        at = AppTest.from_file("app.py", default_timeout=30)
-        at.run()
-        
+        self._select_section("👥 Staffing")
+        original = self.at.slider(key='operating_hours').value
+        self.addCleanup(lambda: self.at.slider(key='operating_hours').set_value(original).run())
+
         # Change Operating Hours
-        at.sidebar.slider('operating_hours').set_value(10).run()
-        
-        self.assertFalse(at.exception)
-        
+        self.at.slider(key='operating_hours').set_value(10).run()
+
+        self.assertFalse(self.at.exception)
+        self.assertEqual(self.at.slider(key='operating_hours').value, 10)
+
 if __name__ == '__main__':
     unittest.main()
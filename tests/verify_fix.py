@@ -66,7 +66,9 @@ def _generate_pro_forma(df_agg, periods):
         if d == 0: return 0.0
         return n / abs(d)
         
-    dscr_series = pd.Series([calc_dscr(n, d) for n, d in zip(noi, prop_debt)]) # Remove explicit index to match others which use default Int index from df_agg
+    debt = np.abs(np.asarray(prop_debt, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dscr_series = pd.Series(np.where(debt == 0, 0.0, np.asarray(noi, dtype=float) / debt), index=df_agg.index)
     data['DSCR'] = dscr_series
 
     # 10. Balance Sheet
@@ -74,8 +76,7 @@ def _generate_pro_forma(df_agg, periods):
         data['Cash on Hand (End of Period)'] = df_agg['Cash_Balance']
     
     df = pd.DataFrame(data)
-    df_t = df.T
-    df_t.columns = periods
+    df_t = pd.DataFrame(np.vstack([df[c].to_numpy(dtype=float) for c in df.columns]), index=df.columns, columns=periods)
     
     # TOTAL Column Logic
     sum_cols = ['Revenue (Operations)', 'Revenue (Real Estate)', 'Total Revenue', 
@@ -84,19 +85,16 @@ def _generate_pro_forma(df_agg, periods):
                 'Net Operating Income (NOI)', 'Debt Service (P&I)', 'Capital Expenditures', 'Net Cash Flow']
     last_cols = ['Cash on Hand (End of Period)']
     
-    total_series = pd.Series(index=df.columns)
-    for c in df.columns:
-        if c in sum_cols:
-            total_series[c] = df[c].sum()
-        elif c in last_cols:
-             total_series[c] = df[c].iloc[-1]
-        elif c == 'DSCR':
-             t_noi = df['Net Operating Income (NOI)'].sum()
-             t_debt = df['Debt Service (P&I)'].sum()
-             total_series[c] = calc_dscr(t_noi, t_debt)
-        else:
-             total_series[c] = 0.0
-             
+    values = df_t.to_numpy()
+    rows = list(df.columns)
+    sum_idx = [rows.index(c) for c in sum_cols if c in rows]
+    last_idx = [rows.index(c) for c in last_cols if c in rows]
+
+    total_series = np.zeros(len(rows))
+    total_series[sum_idx] = values[sum_idx].sum(axis=1)
+    total_series[last_idx] = values[last_idx, -1]
+    total_series[rows.index('DSCR')] = calc_dscr(df['Net Operating Income (NOI)'].sum(), df['Debt Service (P&I)'].sum())
+
     df_t['TOTAL'] = total_series
     
     return df_t
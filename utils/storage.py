@@ -1,16 +1,90 @@
 import json
 import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from datetime import date
 
-SCENARIO_FILE = "scenarios.json"
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is the fallback
+    orjson = None
+
+SCENARIO_DB = "scenarios.db"
+# Pre-SQLite scenario store; imported once into a new, empty database
+LEGACY_SCENARIO_FILE = "scenarios.json"
+
+# Database files this process has already set up (schema, WAL, legacy import)
+_set_up = set()
+_setup_lock = threading.Lock()
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _json_default(obj):
+    # Mirrors what orjson serializes natively / with OPT_SERIALIZE_NUMPY
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, date): # datetime too
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode()
+
+def _import_legacy_file(conn):
+    if not os.path.exists(LEGACY_SCENARIO_FILE):
+        return
+    with open(LEGACY_SCENARIO_FILE, "rb") as f:
+        scenarios = _loads(f.read())
+    # Check and insert in one write transaction, so two processes opening an
+    # empty database can't both import (OR IGNORE covers any name clash)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM scenarios LIMIT 1").fetchone() is None:
+            conn.executemany(
+                "INSERT OR IGNORE INTO scenarios(name, data) VALUES(?, ?)",
+                [(name, _dumps(data)) for name, data in scenarios.items()],
+            )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+def _setup(conn):
+    # WAL lets readers proceed while another connection saves (the mode is stored in the file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS scenarios(name TEXT PRIMARY KEY, data BLOB NOT NULL)")
+    _import_legacy_file(conn)
+
+@contextmanager
+def _connect():
+    """A connection for one call, closed on exit (so no thread keeps one open)."""
+    with closing(sqlite3.connect(SCENARIO_DB)) as conn:
+        if SCENARIO_DB not in _set_up:
+            with _setup_lock:
+                if SCENARIO_DB not in _set_up:
+                    _setup(conn)
+                    _set_up.add(SCENARIO_DB)
+        yield conn
 
 def load_scenarios():
-    if os.path.exists(SCENARIO_FILE):
-        with open(SCENARIO_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    with _connect() as conn:
+        rows = conn.execute("SELECT name, data FROM scenarios ORDER BY rowid").fetchall()
+    return {name: _loads(data) for name, data in rows}
 
 def save_scenario(name, data):
-    scenarios = load_scenarios()
-    scenarios[name] = data
-    with open(SCENARIO_FILE, "w") as f:
-        json.dump(scenarios, f)
+    # Upsert keeps the row (and its place in load order) when overwriting
+    with _connect() as conn, conn:
+        conn.execute(
+            "INSERT INTO scenarios(name, data) VALUES(?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+            (name, _dumps(data)),
+        )
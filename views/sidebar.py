@@ -3,8 +3,9 @@ import os
 import json
 import datetime
 import io
+from dataclasses import asdict
 from model import BusinessEvent
-from services.ai_service import ask_ai
+from services.ai_service import stream_ai
 import glob
 
 # Constants
@@ -265,7 +266,7 @@ def _parse_and_apply_settings(csv_string_content):
     except Exception as e:
         st.error(f"Error parsing file: {e}")
 
-def render_ai_cfo(container, df_projection, model_events, inputs_summary):
+def render_ai_cfo(container, projection, model_events, inputs_summary):
     """Renders the AI CFO interface into the provided sidebar container."""
     with container:
         with st.expander("🤖 Ask the CFO (AI)", expanded=True):
@@ -294,14 +295,15 @@ def render_ai_cfo(container, df_projection, model_events, inputs_summary):
                     st.warning("Please type a question.")
                 else:
                     with st.spinner("Thinking..."):
+                        df_projection = projection.to_frame()
                         context = {
                             "summary": inputs_summary,
                             "data_head": df_projection.head(12).to_dict(),
                             "totals": df_projection[['Store_Revenue', 'Store_Net', 'Prop_Net', 'Owner_Cash_Flow']].sum().to_dict(),
-                            "events": [e.__dict__ for e in model_events if e.is_active]
+                            "events": [asdict(e) for e in model_events if e.is_active]
                         }
-                        response = ask_ai(ai_config, context, user_q)
-                        st.info(response)
+                    # Render the answer as it streams in
+                    st.write_stream(stream_ai(user_q, context, **ai_config))
 
 def get_model_config():
     """Constructs the configuration dictionary from session state."""